@@ -6,7 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.status import HTTP_403_FORBIDDEN
 from pydantic import BaseModel, Field
 import yaml
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pathlib import Path
 import logging
 from crew import LatestAiDevelopmentCrew
@@ -19,10 +19,12 @@ from slowapi.util import get_remote_address
 import json
 import asyncio
 from async_timeout import timeout
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import functools
 from concurrent.futures import ThreadPoolExecutor
 from config.supabase import get_hooks_by_language, get_avoid_words_by_language, get_ctas_by_language
+from monitoring import EventLoopMonitor, SamplingProfiler
+from semantic_cache import SemanticCache
 import sys
 
 # Lade Umgebungsvariablen
@@ -87,6 +89,64 @@ async def get_api_key(
         )
     return api_key_header
 
+# Admin-Key für Diagnose-Endpunkte (ohne gesetzten Key sind sie deaktiviert)
+ADMIN_API_KEY = os.getenv('ADMIN_API_KEY')
+admin_key_header = APIKeyHeader(name="X-Admin-Key", auto_error=False)
+
+async def get_admin_key(
+    admin_key_header: str = Depends(admin_key_header)
+) -> str:
+    if not ADMIN_API_KEY or admin_key_header != ADMIN_API_KEY:
+        logger.warning("Ungültiger Admin-Key-Versuch")
+        raise HTTPException(
+            status_code=HTTP_403_FORBIDDEN,
+            detail="Ungültiger oder fehlender Admin-Key"
+        )
+    return admin_key_header
+
+# Event-Loop-Monitoring und Profiler
+loop_monitor = EventLoopMonitor(
+    interval=float(os.getenv('LOOP_LAG_INTERVAL', '0.1')),
+    slow_threshold=float(os.getenv('LOOP_LAG_THRESHOLD', '0.25'))
+)
+profiler = SamplingProfiler(max_duration=float(os.getenv('PROFILE_MAX_SECONDS', '30')))
+
+# Optionaler semantischer Cache für ähnliche Recherche-Themen
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true'
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'text-embedding-3-small')
+semantic_cache = SemanticCache(
+    model=EMBEDDING_MODEL,
+    max_entries=int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '1000')),
+    threshold=float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.9')),
+    ttl=float(os.getenv('SEMANTIC_CACHE_TTL', str(7 * 24 * 3600))),
+    snapshot_path=os.getenv('SEMANTIC_CACHE_SNAPSHOT', 'cache/semantic_cache.npz')
+) if SEMANTIC_CACHE_ENABLED else None
+
+async def embed_topic(request_data: "TopicRequest") -> List[float]:
+    response = await asyncio.to_thread(
+        lambda: client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=f"{request_data.language}: {request_data.topic}"
+        )
+    )
+    return response.data[0].embedding
+
+# Regelmäßige Snapshots, damit ein Absturz den Cache nicht leert
+SEMANTIC_CACHE_SNAPSHOT_INTERVAL = float(os.getenv('SEMANTIC_CACHE_SNAPSHOT_INTERVAL', '300'))
+semantic_cache_snapshot_task = None
+
+async def snapshot_semantic_cache():
+    while True:
+        await asyncio.sleep(SEMANTIC_CACHE_SNAPSHOT_INTERVAL)
+        await asyncio.to_thread(semantic_cache.save_snapshot)
+
+def research_output(result) -> Optional[str]:
+    """Liefert den Output des research_task aus einem vollständigen Crew-Lauf"""
+    tasks_output = getattr(result, 'tasks_output', None)
+    if not tasks_output:
+        return None
+    return tasks_output[0].raw or None
+
 class LinkedInPost(BaseModel):
     titel: str
     text: str
@@ -150,8 +210,14 @@ crew_instance = None
 
 @app.on_event("startup")
 async def startup_event():
-    global avoid_words, hooks, ctas, prompts, crew_instance
+    global avoid_words, hooks, ctas, prompts, crew_instance, semantic_cache_snapshot_task
     
+    await loop_monitor.start()
+
+    if semantic_cache is not None:
+        await asyncio.to_thread(semantic_cache.load_snapshot)
+        semantic_cache_snapshot_task = asyncio.create_task(snapshot_semantic_cache())
+
     try:            
         prompts_file = Path("config/prompts.md")
         if prompts_file.exists():
@@ -177,12 +243,26 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Fehler beim Laden der Konfiguration: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await loop_monitor.stop()
+    if semantic_cache_snapshot_task is not None:
+        semantic_cache_snapshot_task.cancel()
+    if semantic_cache is not None:
+        await asyncio.to_thread(semantic_cache.save_snapshot)
+
 # Asynchrone Ausführunng der CrewAI-Aufgabe
 async def execute_crew_task(crew, inputs):
     return await asyncio.to_thread(
         lambda: crew.crew().kickoff(inputs=inputs)
     )
 
+# Nur das Reporting auf Basis bereits vorhandener Recherche ausführen
+async def execute_reporting_task(crew, inputs):
+    return await asyncio.to_thread(
+        lambda: crew.reporting_crew().kickoff(inputs=inputs)
+    )
+
 # Timeout für externe Anfragen
 DEFAULT_TIMEOUT = 300  # 5 Minuten
 
@@ -209,6 +289,20 @@ async def execute_task(
             if not tasks_file.exists():
                 logger.error("tasks.yaml nicht gefunden")
                 raise HTTPException(status_code=500, detail="tasks.yaml nicht gefunden")
+
+            # Semantischer Cache: Recherche zu ähnlichen Themen wiederverwenden
+            topic_embedding = None
+            cache_key = None
+            cached_research = None
+            if semantic_cache is not None:
+                # Die Recherche hängt nur von Thema und Sprache ab, Stil-Parameter wirken erst im Reporting
+                cache_key = request_data.language
+                try:
+                    topic_embedding = await embed_topic(request_data)
+                    cached_research = semantic_cache.lookup(topic_embedding, cache_key)
+                except Exception as e:
+                    semantic_cache.record_error()
+                    logger.warning(f"Semantic-Cache-Abfrage fehlgeschlagen, Cache wird übersprungen: {str(e)}")
             
             # Lade sprachabhängige Daten aus Supabase
             try:
@@ -237,19 +331,28 @@ async def execute_task(
                     detail="Error loading language data"
                 )
 
-            result = await execute_crew_task(
-                crew_instance,
-                {
-                    "topic": request_data.topic, 
-                    "language": request_data.language,
-                    "avoid_words": avoid_words,
-                    "hooks": hooks,
-                    "ctas": ctas,  # Neue CTAs werden übergeben
-                    "address": request_data.address,
-                    "mood": request_data.mood,
-                    "perspective": request_data.perspective
-                }
-            )
+            inputs = {
+                "topic": request_data.topic, 
+                "language": request_data.language,
+                "avoid_words": avoid_words,
+                "hooks": hooks,
+                "ctas": ctas,  # Neue CTAs werden übergeben
+                "address": request_data.address,
+                "mood": request_data.mood,
+                "perspective": request_data.perspective
+            }
+
+            if cached_research is not None:
+                result = await execute_reporting_task(
+                    crew_instance,
+                    {**inputs, "research": cached_research}
+                )
+            else:
+                result = await execute_crew_task(crew_instance, inputs)
+                if topic_embedding is not None:
+                    research = research_output(result)
+                    if research:
+                        semantic_cache.store(topic_embedding, cache_key, request_data.topic, research)
             
             # Neue Verarbeitung der Antwort
             if isinstance(result, str):
@@ -287,9 +390,28 @@ async def health_check():
         "timestamp": datetime.utcnow().isoformat(),
         "services": {
             "openai": "healthy" if openai_api_key else "not configured"
-        }
+        },
+        "event_loop": loop_monitor.stats(),
+        "semantic_cache": semantic_cache.stats() if semantic_cache is not None else "disabled"
     }
 
+@app.get("/admin/profile", response_class=PlainTextResponse)
+async def profile_process(
+    seconds: float = 10.0,
+    interval: float = 0.005,
+    admin_key: APIKey = Depends(get_admin_key)
+):
+    """Sampelt den laufenden Prozess und liefert Stacks im Collapsed-Format für Flamegraphs"""
+    try:
+        # Sampling im Thread, damit der Event-Loop selbst mitprofiliert werden kann
+        folded = await asyncio.to_thread(profiler.profile, seconds, interval)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info(f"Profiling über {seconds}s abgeschlossen")
+    return PlainTextResponse(folded)
+
 @app.post("/transform-text", response_model=TextTransformResponse)
 @limiter.limit("100/minute")
 async def transform_text(
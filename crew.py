@@ -50,4 +50,16 @@ class LatestAiDevelopmentCrew():
             tasks=self.tasks,
             process=Process.sequential,
             verbose=False
-        )
\ No newline at end of file
+        )
+
+    def reporting_crew(self) -> Crew:
+        """Creates a crew that only writes the posts from already available research"""
+        config = dict(self.tasks_config['reporting_task'])
+        config['description'] = "Research findings:\n{research}\n\n" + config['description']
+
+        return Crew(
+            agents=[self.reporting_analyst()],
+            tasks=[Task(config=config, output_json=LinkedInResearchOutput)],
+            process=Process.sequential,
+            verbose=False
+        )
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopMonitor:
+    """Misst die Event-Loop-Latenz und loggt den Stack blockierender Callbacks"""
+
+    def __init__(self, interval: float = 0.1, slow_threshold: float = 0.25):
+        if not interval > 0 or not slow_threshold > 0:
+            raise ValueError("interval und slow_threshold müssen größer als 0 sein")
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        # Deutlich feiner als die Schwelle ticken, damit kein Block dazwischen durchrutscht
+        self._period = min(interval, slow_threshold / 4)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._pending_since: Optional[float] = None
+        self._reported_block = False
+        self._lock = threading.Lock()
+        self._samples = 0
+        self._total_lag = 0.0
+        self._max_lag = 0.0
+        self._last_lag = 0.0
+        self._slow_callbacks = 0
+
+    async def start(self):
+        if self._watchdog is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._pending_since = None
+        self._stop.clear()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Event-Loop-Monitor gestartet (Intervall {self._period}s, Schwelle {self.slow_threshold}s)"
+        )
+
+    async def stop(self):
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self._period * 2)
+            self._watchdog = None
+
+    def _heartbeat(self, posted: float):
+        # Läuft auf dem Event-Loop; die Verzögerung seit dem Posten ist der Lag
+        lag = time.monotonic() - posted
+        with self._lock:
+            self._pending_since = None
+            self._reported_block = False
+            self._samples += 1
+            self._total_lag += lag
+            self._last_lag = lag
+            self._max_lag = max(self._max_lag, lag)
+
+    def _watch(self):
+        # Läuft in eigenem Thread, damit ein blockierter Loop erkannt werden kann,
+        # solange der blockierende Code noch auf dem Stack liegt
+        while not self._stop.wait(self._period):
+            now = time.monotonic()
+            with self._lock:
+                if self._pending_since is None:
+                    self._pending_since = now
+                    stalled = None
+                else:
+                    stalled = now - self._pending_since
+                    if stalled <= self.slow_threshold or self._reported_block:
+                        continue
+                    self._reported_block = True
+                    self._slow_callbacks += 1
+            if stalled is None:
+                try:
+                    self._loop.call_soon_threadsafe(self._heartbeat, now)
+                except RuntimeError:
+                    # Loop wurde bereits geschlossen
+                    return
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event-Loop seit {stalled * 1000:.0f} ms blockiert, aktueller Stack:\n{stack}"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            avg = self._total_lag / self._samples if self._samples else 0.0
+            return {
+                "running": self._watchdog is not None,
+                "samples": self._samples,
+                "last_lag_ms": round(self._last_lag * 1000, 2),
+                "avg_lag_ms": round(avg * 1000, 2),
+                "max_lag_ms": round(self._max_lag * 1000, 2),
+                "slow_callbacks": self._slow_callbacks,
+            }
+
+
+class SamplingProfiler:
+    """Zeitlich begrenzter Sampling-Profiler über alle Threads des Prozesses"""
+
+    MIN_INTERVAL = 0.001
+
+    def __init__(self, max_duration: float = 30.0):
+        self.max_duration = max_duration
+        self._busy = threading.Lock()
+
+    def profile(self, duration: float, interval: float = 0.005) -> str:
+        """Sammelt Stacks und liefert sie im Collapsed-Format (flamegraph.pl, speedscope)"""
+        if not math.isfinite(duration) or duration <= 0 or duration > self.max_duration:
+            raise ValueError(f"Dauer muss zwischen 0 und {self.max_duration} Sekunden liegen")
+        if not math.isfinite(interval) or interval < self.MIN_INTERVAL or interval >= duration:
+            raise ValueError(
+                f"Intervall muss mindestens {self.MIN_INTERVAL}s und kleiner als die Dauer sein"
+            )
+        if not self._busy.acquire(blocking=False):
+            raise RuntimeError("Es läuft bereits ein Profiling")
+        try:
+            return self._sample(duration, interval)
+        finally:
+            self._busy.release()
+
+    def _sample(self, duration: float, interval: float) -> str:
+        own_id = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                frames.append(names.get(thread_id, f"thread-{thread_id}"))
+                stacks[";".join(reversed(frames))] += 1
+            time.sleep(interval)
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
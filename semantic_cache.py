@@ -0,0 +1,198 @@
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """In-Memory-Cache für Recherche-Ergebnisse mit Cosine-Similarity-Suche über Embeddings"""
+
+    def __init__(
+        self,
+        model: str,
+        max_entries: int = 1000,
+        threshold: float = 0.9,
+        ttl: float = 7 * 24 * 3600,
+        snapshot_path: Optional[str] = None,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries muss größer als 0 sein")
+        self.model = model
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._keys = np.full(max_entries, "", dtype=object)
+        self._valid = np.zeros(max_entries, dtype=bool)
+        self._created = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._results: list = [None] * max_entries
+        self._topics: list = [None] * max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._dirty = False
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _ensure_storage(self, dim: int) -> bool:
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, dim), dtype=np.float32)
+        return self._vectors.shape[1] == dim
+
+    def _active_mask(self, now: float) -> np.ndarray:
+        mask = self._valid.copy()
+        if self.ttl:
+            mask &= self._created > now - self.ttl
+        return mask
+
+    def lookup(self, vector, key: str) -> Optional[Any]:
+        """Liefert das ähnlichste Ergebnis mit gleichem Schlüssel oberhalb der Schwelle"""
+        query = self._normalize(vector)
+        with self._lock:
+            now = time.time()
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+            mask = self._active_mask(now) & (self._keys == key)
+            if not mask.any():
+                self.misses += 1
+                return None
+            scores = self._vectors @ query
+            scores[~mask] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._last_used[best] = now
+            logger.info(
+                f"Semantic-Cache-Treffer (Similarity {scores[best]:.3f}) für '{self._topics[best]}'"
+            )
+            return self._results[best]
+
+    def store(self, vector, key: str, topic: str, result: Any):
+        vec = self._normalize(vector)
+        with self._lock:
+            if not self._ensure_storage(vec.shape[0]):
+                logger.warning("Embedding-Dimension passt nicht zum Cache, Eintrag wird verworfen")
+                return
+            now = time.time()
+            free = ~self._active_mask(now)
+            if free.any():
+                slot = int(np.argmax(free))
+            else:
+                # LRU: am längsten nicht genutzten Eintrag verdrängen
+                slot = int(np.argmin(self._last_used))
+                self.evictions += 1
+            self._vectors[slot] = vec
+            self._keys[slot] = key
+            self._valid[slot] = True
+            self._created[slot] = now
+            self._last_used[slot] = now
+            self._results[slot] = result
+            self._topics[slot] = topic
+            self._dirty = True
+
+    def record_error(self):
+        """Zählt Anfragen, bei denen der Cache wegen eines Fehlers nicht befragt werden konnte"""
+        with self._lock:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses + self.errors
+            return {
+                "size": int(self._active_mask(time.time()).sum()),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def save_snapshot(self):
+        if self.snapshot_path is None:
+            return
+        with self._lock:
+            # Unveränderten Stand nicht erneut schreiben
+            if self._vectors is None or not self._dirty:
+                return
+            self._dirty = False
+            slots = np.flatnonzero(self._active_mask(time.time()))
+            vectors = self._vectors[slots].copy()
+            entries = [
+                {
+                    "key": self._keys[i],
+                    "topic": self._topics[i],
+                    "created": float(self._created[i]),
+                    "last_used": float(self._last_used[i]),
+                    "result": self._results[i],
+                }
+                for i in slots
+            ]
+            meta = {"model": self.model, "dim": int(vectors.shape[1]), "entries": entries}
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, vectors=vectors, meta=np.array(json.dumps(meta)))
+            tmp_path.replace(self.snapshot_path)
+            logger.info(f"Semantic-Cache-Snapshot mit {len(entries)} Einträgen gespeichert")
+        except Exception as e:
+            with self._lock:
+                self._dirty = True
+            logger.error(f"Fehler beim Speichern des Semantic-Cache-Snapshots: {str(e)}")
+
+    def load_snapshot(self):
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return
+        try:
+            with np.load(self.snapshot_path, allow_pickle=False) as data:
+                vectors = data["vectors"]
+                meta = json.loads(str(data["meta"]))
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Semantic-Cache-Snapshots: {str(e)}")
+            return
+        # Vektoren eines anderen Embedding-Modells sind nicht vergleichbar
+        if (
+            not isinstance(meta, dict)
+            or meta.get("model") != self.model
+            or meta.get("dim") != vectors.shape[1]
+        ):
+            logger.warning(
+                f"Semantic-Cache-Snapshot passt nicht zum Embedding-Modell {self.model}, Snapshot wird verworfen"
+            )
+            self.snapshot_path.unlink(missing_ok=True)
+            return
+        entries = meta["entries"]
+        # Bei mehr Einträgen als erlaubt die zuletzt genutzten behalten
+        order = sorted(range(len(entries)), key=lambda i: entries[i]["last_used"], reverse=True)
+        order = order[:self.max_entries]
+        if not order:
+            return
+        with self._lock:
+            self._ensure_storage(vectors.shape[1])
+            for slot, i in enumerate(order):
+                self._vectors[slot] = vectors[i]
+                self._keys[slot] = entries[i]["key"]
+                self._valid[slot] = True
+                self._created[slot] = entries[i]["created"]
+                self._last_used[slot] = entries[i]["last_used"]
+                self._results[slot] = entries[i]["result"]
+                self._topics[slot] = entries[i]["topic"]
+        logger.info(f"Semantic-Cache-Snapshot mit {len(order)} Einträgen geladen")
@@ -0,0 +1,137 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+pytest.importorskip("fastapi")
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "test")
+os.environ.setdefault("API_KEY", "test-key")
+
+from fastapi.testclient import TestClient
+
+import api
+from crew import LatestAiDevelopmentCrew
+from semantic_cache import SemanticCache
+
+POSTS = [{"titel": "Titel", "text": "Text", "cta": "👉 CTA"}]
+EMBEDDINGS = {
+    "KI im Marketing": [1.0, 0.0, 0.0],
+    "Künstliche Intelligenz im Marketing": [0.95, 0.1, 0.0],
+}
+
+
+class StubKickoff:
+    def __init__(self, runs, result):
+        self.runs = runs
+        self.result = result
+
+    def kickoff(self, inputs):
+        self.runs.append(inputs)
+        return self.result
+
+
+class StubCrew:
+    def __init__(self):
+        self.full_runs = []
+        self.reporting_runs = []
+
+    def crew(self):
+        result = SimpleNamespace(
+            json_dict={"posts": POSTS},
+            tasks_output=[SimpleNamespace(raw="research findings"), SimpleNamespace(raw="posts")]
+        )
+        return StubKickoff(self.full_runs, result)
+
+    def reporting_crew(self):
+        return StubKickoff(self.reporting_runs, SimpleNamespace(json_dict={"posts": POSTS}))
+
+
+@pytest.fixture
+def stub_crew(monkeypatch):
+    crew = StubCrew()
+    monkeypatch.setattr(api, "crew_instance", crew)
+    monkeypatch.setattr(api, "semantic_cache", SemanticCache(model="test"))
+
+    async def embed_topic(request_data):
+        return EMBEDDINGS[request_data.topic]
+
+    async def language_data(language):
+        return ["eintrag"]
+
+    monkeypatch.setattr(api, "embed_topic", embed_topic)
+    monkeypatch.setattr(api, "get_hooks_by_language", language_data)
+    monkeypatch.setattr(api, "get_avoid_words_by_language", language_data)
+    monkeypatch.setattr(api, "get_ctas_by_language", language_data)
+    return crew
+
+
+def post_task(topic, mood="inspiring"):
+    return TestClient(api.app).post(
+        "/task/research_task",
+        headers={"X-API-Key": api.API_KEY},
+        json={
+            "topic": topic,
+            "language": "DE",
+            "address": "Informally",
+            "mood": mood,
+            "perspective": "Me"
+        }
+    )
+
+
+def test_miss_stores_research_output(stub_crew):
+    response = post_task("KI im Marketing")
+
+    assert response.status_code == 200
+    assert response.json() == {"posts": POSTS}
+    assert len(stub_crew.full_runs) == 1
+    assert api.semantic_cache.lookup(EMBEDDINGS["KI im Marketing"], "DE") == "research findings"
+
+
+def test_near_duplicate_hit_runs_only_reporting(stub_crew):
+    post_task("KI im Marketing")
+    response = post_task("Künstliche Intelligenz im Marketing", mood="provocative")
+
+    assert response.status_code == 200
+    assert len(stub_crew.full_runs) == 1
+    assert len(stub_crew.reporting_runs) == 1
+    inputs = stub_crew.reporting_runs[0]
+    assert inputs["research"] == "research findings"
+    assert inputs["mood"] == "provocative"
+    assert inputs["ctas"] == ["eintrag"]
+
+
+def test_embedding_failure_falls_back_to_full_crew(stub_crew, monkeypatch):
+    async def failing_embed_topic(request_data):
+        raise RuntimeError("embedding down")
+
+    monkeypatch.setattr(api, "embed_topic", failing_embed_topic)
+    response = post_task("KI im Marketing")
+
+    assert response.status_code == 200
+    assert len(stub_crew.full_runs) == 1
+    assert not stub_crew.reporting_runs
+    assert api.semantic_cache.stats()["errors"] == 1
+
+
+def test_research_output_uses_first_task():
+    result = SimpleNamespace(tasks_output=[SimpleNamespace(raw="research"), SimpleNamespace(raw="posts")])
+
+    assert api.research_output(result) == "research"
+    assert api.research_output(SimpleNamespace(tasks_output=[])) is None
+    assert api.research_output("kein CrewOutput") is None
+
+
+def test_reporting_crew_prefixes_research():
+    crew_definition = LatestAiDevelopmentCrew()
+    reporting = crew_definition.reporting_crew()
+
+    assert len(reporting.tasks) == 1
+    task = reporting.tasks[0]
+    assert task.description.startswith("Research findings:\n{research}\n\n")
+    assert "{avoid_words}" in task.description
+    assert task.agent.role == crew_definition.reporting_analyst().role
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from monitoring import EventLoopMonitor, SamplingProfiler
+
+
+@pytest.mark.parametrize("duration,interval", [
+    (float("nan"), 0.01),
+    (float("inf"), 0.01),
+    (1.0, float("nan")),
+    (1.0, float("inf")),
+    (1.0, 0.0005),
+    (1.0, 1.0),
+    (1.0, 2.0),
+    (0.0, 0.01),
+    (31.0, 0.01),
+])
+def test_profile_rejects_invalid_parameters(duration, interval):
+    with pytest.raises(ValueError):
+        SamplingProfiler(max_duration=30.0).profile(duration, interval)
+
+
+def test_profile_rejects_concurrent_run():
+    profiler = SamplingProfiler()
+    worker = threading.Thread(target=profiler.profile, args=(0.5, 0.01))
+    worker.start()
+    try:
+        while not profiler._busy.locked():
+            time.sleep(0.001)
+        with pytest.raises(RuntimeError):
+            profiler.profile(0.1, 0.01)
+    finally:
+        worker.join()
+
+
+def _busy_target(stop):
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+def test_profile_returns_folded_stacks():
+    stop = threading.Event()
+    target = threading.Thread(target=_busy_target, args=(stop,), name="profile-target")
+    target.start()
+    try:
+        folded = SamplingProfiler().profile(0.1, 0.005)
+    finally:
+        stop.set()
+        target.join()
+
+    lines = folded.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert len(stack.split(";")) >= 2
+    target_lines = [line for line in lines if line.startswith("profile-target;")]
+    assert target_lines
+    assert any("_busy_target (" in line for line in target_lines)
+
+
+def test_monitor_reports_single_stall(caplog):
+    async def run():
+        monitor = EventLoopMonitor(interval=0.02, slow_threshold=0.1)
+        await monitor.start()
+        await asyncio.sleep(0.1)
+        time.sleep(0.4)
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        return monitor.stats()
+
+    with caplog.at_level(logging.WARNING, logger="monitoring"):
+        stats = asyncio.run(run())
+
+    assert stats["slow_callbacks"] == 1
+    assert stats["max_lag_ms"] >= 300
+    stall_logs = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(stall_logs) == 1
+    assert "test_monitor_reports_single_stall" in stall_logs[0].getMessage()
+
+
+def test_monitor_rejects_non_positive_settings():
+    with pytest.raises(ValueError):
+        EventLoopMonitor(interval=0)
+    with pytest.raises(ValueError):
+        EventLoopMonitor(slow_threshold=0)
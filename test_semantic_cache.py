@@ -0,0 +1,112 @@
+import numpy as np
+
+import semantic_cache
+from semantic_cache import SemanticCache
+
+A = [1.0, 0.0, 0.0]
+B = [0.0, 1.0, 0.0]
+C = [0.0, 0.0, 1.0]
+
+
+def test_similar_topic_hits_and_dissimilar_misses():
+    cache = SemanticCache(model="m", threshold=0.9)
+    cache.store(A, "research_task|DE", "KI im Marketing", "research A")
+
+    assert cache.lookup([0.95, 0.1, 0.0], "research_task|DE") == "research A"
+    assert cache.lookup(B, "research_task|DE") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_isolation():
+    cache = SemanticCache(model="m")
+    cache.store(A, "research_task|DE", "KI im Marketing", "research DE")
+
+    assert cache.lookup(A, "research_task|EN") is None
+    assert cache.lookup(A, "research_task|DE") == "research DE"
+
+
+def test_lru_eviction():
+    cache = SemanticCache(model="m", max_entries=2)
+    cache.store(A, "k", "a", "research A")
+    cache.store(B, "k", "b", "research B")
+    assert cache.lookup(A, "k") == "research A"
+
+    cache.store(C, "k", "c", "research C")
+
+    assert cache.lookup(B, "k") is None
+    assert cache.lookup(A, "k") == "research A"
+    assert cache.lookup(C, "k") == "research C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: now[0])
+    cache = SemanticCache(model="m", ttl=60)
+    cache.store(A, "k", "a", "research A")
+
+    now[0] += 30
+    assert cache.lookup(A, "k") == "research A"
+    now[0] += 31
+    assert cache.lookup(A, "k") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_errors_count_against_hit_rate():
+    cache = SemanticCache(model="m")
+    cache.store(A, "k", "a", "research A")
+    cache.lookup(A, "k")
+    cache.record_error()
+
+    stats = cache.stats()
+    assert stats["errors"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "cache.npz"
+    cache = SemanticCache(model="m", snapshot_path=str(path))
+    cache.store(A, "k", "a", "research A")
+    cache.store(B, "k", "b", "research B")
+    cache.save_snapshot()
+
+    restored = SemanticCache(model="m", snapshot_path=str(path))
+    restored.load_snapshot()
+
+    assert restored.lookup(A, "k") == "research A"
+    assert restored.lookup(B, "k") == "research B"
+    assert restored.stats()["size"] == 2
+
+
+def test_snapshot_from_other_model_is_dropped(tmp_path):
+    path = tmp_path / "cache.npz"
+    cache = SemanticCache(model="old", snapshot_path=str(path))
+    cache.store(A, "k", "a", "research A")
+    cache.save_snapshot()
+
+    restored = SemanticCache(model="new", snapshot_path=str(path))
+    restored.load_snapshot()
+
+    assert not path.exists()
+    assert restored.lookup(A, "k") is None
+    # Neue Dimension ist nach dem Verwerfen nutzbar
+    restored.store(np.ones(4), "k", "d", "research D")
+    assert restored.lookup(np.ones(4), "k") == "research D"
+
+
+def test_snapshot_only_written_after_changes(tmp_path):
+    path = tmp_path / "cache.npz"
+    cache = SemanticCache(model="m", snapshot_path=str(path))
+    cache.save_snapshot()
+    assert not path.exists()
+
+    cache.store(A, "k", "a", "research A")
+    cache.save_snapshot()
+    path.unlink()
+    cache.save_snapshot()
+    assert not path.exists()
+
+    cache.store(B, "k", "b", "research B")
+    cache.save_snapshot()
+    assert path.exists()